@@ -1,129 +1,158 @@
 import os
-import re
-from flask import Flask, request, render_template, redirect, url_for, flash
-from flask_sqlalchemy import SQLAlchemy
+import shutil
+import uuid
+import hashlib
+import logging
+from functools import lru_cache
+from flask import (Blueprint, Flask, current_app, request, render_template, redirect,
+                   url_for, flash, make_response, session)
+from sqlalchemy import func
 from werkzeug.utils import secure_filename
-import markdown2
 
-# Import your existing CodeCredX flow
-from flow import create_codecredx_flow
+from models import db, Candidate, init_db
+from utils.render_markdown import render_markdown
+from utils.github_username import extract_github_username
+from flow import create_shared_store, get_codecredx_flow
+from tasks import enqueue_analysis, fail_orphaned_analyses
 from main import setup_logging
 
 # --- App Configuration ---
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf', 'txt'}
+MAX_UPLOAD_SIZE = 20 * 1024 * 1024 # 20 MiB
+UPLOAD_CHUNK_SIZE = 1 << 20 # 1 MiB
+LEADERBOARD_PAGE_SIZE = 50
 
-app = Flask(__name__)
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///candidates.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['SECRET_KEY'] = 'a-secure-random-secret-key' # Change this in production
-
-db = SQLAlchemy(app)
-logger = setup_logging()
-codecredx_flow = create_codecredx_flow()
-
-# --- Database Model ---
-class Candidate(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    github_username = db.Column(db.String(100), nullable=False)
-    overall_score = db.Column(db.Float, nullable=False)
-    elo_score = db.Column(db.Float, nullable=False)
-    report_markdown = db.Column(db.Text, nullable=False)
-    
-    def __repr__(self):
-        return f'<Candidate {self.github_username}>'
+logger = logging.getLogger(__name__)
+bp = Blueprint('main', __name__)
 
 # --- Helper Functions ---
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 def extract_username_from_url(url):
-    match = re.search(r'github\.com/([a-zA-Z0-9_-]+)', url, re.IGNORECASE)
-    return match.group(1) if match else "N/A"
+    return extract_github_username(url) or "N/A"
 
 # --- Web Routes ---
-@app.route('/')
+@bp.route('/')
 def index():
     """Renders the main submission form."""
     return render_template('index.html')
 
-@app.route('/leaderboard')
+@lru_cache(maxsize=32)
+def _leaderboard_page(version, page):
+    """
+    Loads one page of the leaderboard. `version` changes whenever a candidate
+    completes, so stale entries are simply never looked up again.
+    """
+    # Select only the listed columns so the large report TEXT columns are never read
+    return (Candidate.query.with_entities(Candidate.id, Candidate.github_username,
+                                          Candidate.overall_score, Candidate.elo_score)
+            .filter_by(status="completed")
+            .order_by(Candidate.elo_score.desc())
+            .paginate(page=page, per_page=LEADERBOARD_PAGE_SIZE, error_out=False))
+
+@bp.route('/leaderboard')
 def leaderboard():
     """Displays all candidates ranked by Elo score."""
-    candidates = Candidate.query.order_by(Candidate.elo_score.desc()).all()
-    return render_template('leaderboard.html', candidates=candidates)
-
-@app.route('/report/<int:candidate_id>')
+    page = request.args.get('page', 1, type=int)
+    # Completed rows are immutable, so their count and highest id identify the leaderboard state
+    completed_count, max_id = (db.session.query(func.count(Candidate.id), func.max(Candidate.id))
+                               .filter(Candidate.status == "completed").one())
+    version = f"{completed_count}-{max_id}"
+    etag = hashlib.blake2s(f"{version}:{page}".encode()).hexdigest()
+    # Pending flash messages must still be rendered, so only short-circuit without them
+    if '_flashes' not in session and request.if_none_match.contains(etag):
+        response = make_response('', 304)
+        response.set_etag(etag)
+        return response
+
+    pagination = _leaderboard_page(version, page)
+    response = make_response(render_template('leaderboard.html', candidates=pagination.items, pagination=pagination))
+    response.set_etag(etag)
+    return response
+
+@bp.route('/report/<int:candidate_id>')
 def report(candidate_id):
     """Displays the detailed report for a single candidate."""
     candidate = Candidate.query.get_or_404(candidate_id)
-    # Convert markdown report to HTML for rendering
-    report_html = markdown2.markdown(candidate.report_markdown)
-    return render_template('report.html', candidate=candidate, report_html=report_html)
-
-@app.route('/submit', methods=['POST'])
+    if candidate.status == "pending":
+        return render_template('report.html', candidate=candidate, report_html=None)
+    if candidate.report_html is None:
+        # Rows written before the HTML was cached: render once and store it
+        candidate.report_html = render_markdown(candidate.report_markdown)
+        db.session.commit()
+    return render_template('report.html', candidate=candidate, report_html=candidate.report_html)
+
+@bp.route('/submit', methods=['POST'])
 def submit():
-    """Handles the form submission and runs the analysis."""
+    """Handles the form submission and queues the analysis."""
     github_url = request.form.get('github_profile')
     resume_file = request.files.get('resume_file')
     
     if not github_url and (not resume_file or resume_file.filename == ''):
         flash('Please provide a GitHub Profile URL or a resume file.', 'error')
-        return redirect(url_for('index'))
+        return redirect(url_for('main.index'))
 
     resume_path = None
     if resume_file and allowed_file(resume_file.filename):
-        filename = secure_filename(resume_file.filename)
-        resume_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        resume_file.save(resume_path)
+        # Prefix a uuid so concurrent uploads with the same name (e.g. resume.pdf) don't
+        # overwrite each other before the queued analysis reads them
+        filename = f"{uuid.uuid4().hex}_{secure_filename(resume_file.filename)}"
+        resume_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+        # Stream the upload to disk in fixed-size chunks instead of buffering it whole
+        with open(resume_path, 'wb') as dst:
+            shutil.copyfileobj(resume_file.stream, dst, UPLOAD_CHUNK_SIZE)
         logger.info(f"Saved uploaded resume to {resume_path}")
 
     # Prepare the shared dictionary for the flow
-    shared = {
-        "resume_file_path": resume_path,
-        "github_profile_url": github_url,
-        "resume_text": None,
-        "github_project_urls": [],
-        "other_urls": [],
-        "analyzed_github_projects": [],
-        "overall_candidate_metrics": {},
-        "candidate_report": "Processing...",
-    }
-    
-    logger.info("Starting CodeCredX flow from web submission...")
-    # NOTE: In a production app, this should be offloaded to a background worker (e.g., Celery)
-    # to avoid long request timeouts. For this example, we run it synchronously.
-    try:
-        codecredx_flow.run(shared)
-        logger.info("CodeCredX flow completed successfully.")
-    except Exception as e:
-        logger.critical(f"An error occurred during flow execution: {e}", exc_info=True)
-        flash('An unexpected error occurred during analysis.', 'error')
-        return redirect(url_for('index'))
-
-    # Extract results from the shared dictionary
-    metrics = shared.get("overall_candidate_metrics", {})
-    report_md = shared.get("candidate_report", "Report could not be generated.")
+    shared = create_shared_store(resume_path, github_url)
     
-    # Save results to the database
+    # Insert a pending candidate row; the background worker fills in the results
     new_candidate = Candidate(
         github_username=extract_username_from_url(github_url) if github_url else "From_Resume",
-        overall_score=metrics.get('overall_candidate_score', 0.0),
-        elo_score=metrics.get('elo_score', 800.0),
-        report_markdown=report_md
+        status="pending",
+        worker_pid=os.getpid(), # This process's executor runs the analysis
     )
-    db.session.add(new_candidate)
-    db.session.commit()
-    logger.info(f"Saved new candidate (ID: {new_candidate.id}) to database.")
-
-    # Redirect to the new candidate's report page
-    return redirect(url_for('report', candidate_id=new_candidate.id))
+    with db.session.begin():
+        db.session.add(new_candidate)
+    logger.info(f"Created pending candidate (ID: {new_candidate.id}), queueing analysis.")
+
+    # The flow runs on a background worker so the request returns immediately
+    enqueue_analysis(current_app._get_current_object(), new_candidate.id, shared)
+
+    # Redirect to the new candidate's report page, which refreshes until the analysis is done
+    return redirect(url_for('main.report', candidate_id=new_candidate.id))
+
+# --- Application Factory ---
+def create_app():
+    """
+    Creates and configures the Flask application.
+    Production: gunicorn "app:create_app()" -b 0.0.0.0:5001 -w 4 --threads 8 --timeout 120
+    """
+    setup_logging(console=False) # The web worker logs to file only
+
+    app = Flask(__name__)
+    app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+    app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_SIZE
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///candidates.db'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'a-secure-random-secret-key') # Change this in production
+
+    db.init_app(app)
+    app.register_blueprint(bp)
+
+    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+    get_codecredx_flow() # Build the node graph once per worker, before the first request
+    with app.app_context():
+        # Create the database and tables if they don't exist, then add columns
+        # that databases created by older versions are missing
+        init_db()
+        # Analyses queued in workers that have since exited will never finish
+        fail_orphaned_analyses()
+    return app
 
 # --- Main Entry Point ---
 if __name__ == '__main__':
-    with app.app_context():
-        # Create the database and tables if they don't exist
-        db.create_all()
-    # Run the web server
-    app.run(debug=True, port=5001)
\ No newline at end of file
+    # Run the development server; use gunicorn (see create_app) for concurrent requests
+    create_app().run(debug=True, port=5001)
@@ -1,5 +1,6 @@
 # config.py
 import os
+from typing import List
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -12,17 +13,34 @@ class Config:
     """
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "your-openai-api-key-here")
     GITHUB_TOKEN: str = os.getenv("GITHUB_TOKEN", "your-github-personal-access-token-here") # Recommended for higher rate limits
+    # Optional comma-separated list of tokens; requests rotate through them to multiply the rate limit
+    GITHUB_TOKENS: List[str] = [token.strip() for token in os.getenv("GITHUB_TOKENS", "").split(",") if token.strip()]
 
     # Logging configuration
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper() # INFO, DEBUG, WARNING, ERROR, CRITICAL
     LOG_FILE: str = os.getenv("LOG_FILE", "codecredx.log")
+    LOG_MAX_BYTES: int = int(os.getenv("LOG_MAX_BYTES", "10000000")) # CLI rotates the log file after ~10 MB
+    LOG_BACKUP_COUNT: int = int(os.getenv("LOG_BACKUP_COUNT", "3"))
+    LOG_BUFFER_CAPACITY: int = int(os.getenv("LOG_BUFFER_CAPACITY", "1024")) # Records buffered per file write
 
     # GitHub API Configuration
     GITHUB_API_BASE_URL: str = "https://api.github.com/repos/"
+    GITHUB_GRAPHQL_URL: str = "https://api.github.com/graphql"
+    GITHUB_GRAPHQL_BATCH_SIZE: int = int(os.getenv("GITHUB_GRAPHQL_BATCH_SIZE", "25")) # Repositories per GraphQL query
+    GITHUB_MAX_WORKERS: int = int(os.getenv("GITHUB_MAX_WORKERS", "16")) # Concurrent repo fetches
+    GITHUB_MAX_RETRIES: int = int(os.getenv("GITHUB_MAX_RETRIES", "5")) # Retries on rate limits and 5xx responses
+    GITHUB_RATE_LIMIT_MAX_WAIT: int = int(os.getenv("GITHUB_RATE_LIMIT_MAX_WAIT", "60")) # seconds to wait for a rate limit reset when every token is exhausted
+    GITHUB_CACHE_FILE: str = os.getenv("GITHUB_CACHE_FILE", "gh_cache.sqlite")
+    GITHUB_CACHE_EXPIRE: int = int(os.getenv("GITHUB_CACHE_EXPIRE", "3600")) # seconds before revalidating
 
     # LLM Configuration
     LLM_MODEL: str = "gpt-4o"
     LLM_TIMEOUT: int = 60 # seconds
+    LLM_MAX_WORKERS: int = int(os.getenv("LLM_MAX_WORKERS", "5")) # Concurrent summarization calls
+    LLM_README_MAX_CHARS: int = int(os.getenv("LLM_README_MAX_CHARS", "6000")) # README characters sent for summarization
+
+    # Background analysis workers used by the web app
+    ANALYSIS_WORKERS: int = int(os.getenv("ANALYSIS_WORKERS", "2"))
 
 # Instantiate the Config class for easy access
 app_config = Config()
@@ -1,9 +1,31 @@
 # flow.py
+import logging
+import threading
+from typing import Any, Dict, Optional
 from pocketflow import Flow
 from nodes import (ResumeInputNode, URLExtractionNode, GitHubAnalyzerNode, 
-                     LLMSummarizerNode, ContributionNode, OriginalityNode, 
-                     TrustHeuristicNode, CandidateAggregationNode, EloRankingNode, 
-                     ReportGenerationNode, GitHubProfileFetcherNode, URLConsolidatorNode)
+                     LLMSummarizerNode, ProjectScoringNode, CandidateAggregationNode,
+                     EloRankingNode, ReportGenerationNode, GitHubProfileFetcherNode,
+                     URLConsolidatorNode)
+
+logger = logging.getLogger(__name__)
+
+_flow_singleton = None
+_flow_lock = threading.Lock()
+
+# The nodes run in this order; each one hands off to the next on "default"
+PIPELINE = [
+    ResumeInputNode,
+    URLExtractionNode,
+    GitHubProfileFetcherNode,
+    URLConsolidatorNode,
+    GitHubAnalyzerNode,
+    LLMSummarizerNode,
+    ProjectScoringNode,
+    CandidateAggregationNode,
+    EloRankingNode,
+    ReportGenerationNode,
+]
 
 def create_codecredx_flow():
     """
@@ -14,37 +36,42 @@ def create_codecredx_flow():
     aggregates these scores, assigns a simulated Elo ranking, and finally generates
     a comprehensive candidate report.
     """
-    print("Creating CodeCredX flow...")
-
-    # Initialize all nodes
-    resume_input_node = ResumeInputNode()
-    url_extraction_node = URLExtractionNode()
-    github_profile_fetcher_node = GitHubProfileFetcherNode()
-    url_consolidator_node = URLConsolidatorNode()
-    github_analyzer_node = GitHubAnalyzerNode()
-    llm_summarizer_node = LLMSummarizerNode()
-    contribution_node = ContributionNode()
-    originality_node = OriginalityNode()
-    trust_heuristic_node = TrustHeuristicNode()
-    candidate_aggregation_node = CandidateAggregationNode()
-    elo_ranking_node = EloRankingNode()
-    report_generation_node = ReportGenerationNode()
-
-    # Define the sequence of nodes
-    resume_input_node >> url_extraction_node
-    url_extraction_node >> github_profile_fetcher_node
-    github_profile_fetcher_node >> url_consolidator_node
-    url_consolidator_node >> github_analyzer_node
-    github_analyzer_node >> llm_summarizer_node
-    llm_summarizer_node >> contribution_node
-    contribution_node >> originality_node
-    originality_node >> trust_heuristic_node
-    trust_heuristic_node >> candidate_aggregation_node
-    candidate_aggregation_node >> elo_ranking_node
-    elo_ranking_node >> report_generation_node
-
-    # The flow starts with the ResumeInputNode
-    return Flow(start=resume_input_node)
-
-# Create an instance of the flow for direct import
-codecredx_flow = create_codecredx_flow()
\ No newline at end of file
+    logger.debug("Creating CodeCredX flow...")
+
+    # Initialize all nodes and chain them in PIPELINE order
+    nodes = [node_cls() for node_cls in PIPELINE]
+    for current_node, next_node in zip(nodes, nodes[1:]):
+        current_node >> next_node
+
+    # The flow starts with the first node (ResumeInputNode)
+    return Flow(start=nodes[0])
+
+def create_shared_store(resume_file_path: Optional[str] = None, github_profile_url: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Returns a fresh shared store for one flow run, with every key the nodes
+    read or write present up front.
+    """
+    return {
+        "resume_file_path": resume_file_path,
+        "github_profile_url": github_profile_url,
+        "resume_text": None,
+        "resume_github_urls": [],
+        "profile_github_urls": [],
+        "github_project_urls": [], # This will be the final consolidated list
+        "other_urls": [],
+        "analyzed_github_projects": [],
+        "overall_candidate_metrics": {},
+        "candidate_report": None,
+    }
+
+def get_codecredx_flow():
+    """
+    Returns the process-wide CodeCredX flow, building it on first use.
+    The flow copies its nodes on every run, so one instance can be shared.
+    """
+    global _flow_singleton
+    if _flow_singleton is None:
+        with _flow_lock:
+            if _flow_singleton is None:
+                _flow_singleton = create_codecredx_flow()
+    return _flow_singleton
@@ -1,51 +1,175 @@
 # main.py
+import atexit
+import functools
 import logging
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener, RotatingFileHandler, WatchedFileHandler
+import queue
 import sys
 import os
-import json
-import argparse
-from flow import create_codecredx_flow
+from typing import TYPE_CHECKING, List
 from config import app_config
 
-def setup_logging():
+if TYPE_CHECKING:
+    import argparse
+
+# Machine-readable per-run results; written to the log file but kept off the console
+RESULTS_LOGGER_NAME = "codecredx.results"
+results_logger = logging.getLogger(RESULTS_LOGGER_NAME)
+
+# Third-party loggers that are capped at WARNING
+_NOISY_LOGGERS = ("requests", "urllib3", "openai")
+
+def setup_logging(console: bool = True):
     """
     Sets up the logging configuration for the application.
-    Logs to both console and a file.
+    The CLI logs to the console and to a rotating file written in buffered batches.
+    Under an app server (console=False), several processes share the file, so it is
+    written through unbuffered and rotation is left to an external tool. Handler
+    I/O runs on a background QueueListener thread so logging calls never block.
+    Safe to call more than once; only the first call installs handlers, and
+    none are installed if the root logger is already configured.
     """
+    if getattr(setup_logging, "_done", False):
+        return logging.getLogger(__name__)
+    if logging.getLogger().hasHandlers():
+        # Logging was already configured by the host (test runner, app server); keep it
+        setup_logging._done = True
+        return logging.getLogger(__name__)
+
     # Create logs directory if it doesn't exist
     log_dir = "logs"
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
+    os.makedirs(log_dir, exist_ok=True)
 
     log_file_path = os.path.join(log_dir, app_config.LOG_FILE)
 
-    logging.basicConfig(
-        level=app_config.LOG_LEVEL,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file_path),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
-    logging.getLogger("requests").setLevel(logging.WARNING)
-    logging.getLogger("urllib3").setLevel(logging.WARNING)
-    logging.getLogger("openai").setLevel(logging.WARNING)
+    # One formatter shared by all handlers; an explicit datefmt skips the msec suffix
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+    if console:
+        # The CLI owns the process and its format never uses thread/process fields, so
+        # don't collect them per record. Under an app server these flags are left alone:
+        # they are process-wide and the server's own formats may use %(process)d.
+        logging.logThreads = False
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
+
+        file_handler = RotatingFileHandler(log_file_path, maxBytes=app_config.LOG_MAX_BYTES, backupCount=app_config.LOG_BACKUP_COUNT)
+        file_handler.setFormatter(formatter)
+        # The CLI is a short run that exits cleanly, so buffer file records and write
+        # them in batches; errors are flushed immediately
+        buffered_file_handler = MemoryHandler(
+            capacity=app_config.LOG_BUFFER_CAPACITY,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+            flushOnClose=True
+        )
+        atexit.register(buffered_file_handler.close)
+
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(formatter)
+        stream_handler.addFilter(lambda record: not record.name.startswith(RESULTS_LOGGER_NAME))
+        handlers = [buffered_file_handler, stream_handler]
+    else:
+        # Several app server workers append to the same file, and rotating it from each
+        # process loses records; rotation is left to an external tool such as logrotate,
+        # and WatchedFileHandler reopens the file once it has been moved. Records are
+        # written through unbuffered so the log doesn't lag behind long-lived workers
+        # and a killed worker loses nothing.
+        file_handler = WatchedFileHandler(log_file_path)
+        file_handler.setFormatter(formatter)
+        handlers = [file_handler]
+
+    # Callers only enqueue records; a listener thread does the formatting and I/O
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop) # Runs before any buffer is closed, draining the queue first
+    setup_logging._listener = listener
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(app_config.LOG_LEVEL)
+    root_logger.addHandler(QueueHandler(log_queue))
+    for noisy_logger_name in _NOISY_LOGGERS:
+        logging.getLogger(noisy_logger_name).setLevel(logging.WARNING)
+    setup_logging._done = True
 
     logger = logging.getLogger(__name__)
-    logger.info(f"Logging configured. Log level: {app_config.LOG_LEVEL}, Log file: {log_file_path}")
+    logger.info("Logging configured. Log level: %s, Log file: %s", app_config.LOG_LEVEL, log_file_path)
     return logger
 
+def flush_logging() -> None:
+    """
+    Blocks until every record logged so far has been handled by the listener
+    thread, so output written directly to stdout afterwards cannot interleave
+    with log lines that are still queued.
+    """
+    listener = getattr(setup_logging, "_listener", None)
+    if listener is None:
+        return
+    listener.stop() # Handles the queued records, then joins the listener thread
+    listener.start()
+
+def _render_project(project) -> str:
+    """Renders one analyzed project as the multi-line console block."""
+    lines = [f"\n--- Project: {project['url']} ---", f"  Status: {project['status']}"]
+    if project.get('error'):
+        lines.append(f"  Error: {project['error']}")
+    lines.append("  Metadata:")
+    lines.extend(
+        f"    {key}: {value[:70] + '...' if key == 'description' and value and len(value) > 70 else value}"
+        for key, value in project['metadata'].items()
+    )
+    readme_content = project.get('readme_content')
+    if readme_content:
+        lines.append(f"  README Content (first 100 chars):\n    {readme_content[:100]}...")
+    else:
+        lines.append("  README Content: Not available or failed to fetch.")
+    lines.append(f"  LLM Summary: {project.get('summary')}")
+    lines.append("  Scores:")
+    if project.get("scores"):
+        lines.extend(f"    {score_name}: {score_value}" for score_name, score_value in project["scores"].items())
+    else:
+        lines.append("    No scores assigned.")
+    return "\n".join(lines)
+
+def _trim_for_log(value, limit: int = 200, max_items: int = 50):
+    """
+    Returns a copy of `value` that is cheap to serialize for debug logs:
+    long strings are elided and lists are capped at `max_items` entries.
+    """
+    if isinstance(value, str):
+        return value if len(value) <= limit else f"<{len(value)} chars elided>"
+    if isinstance(value, dict):
+        return {key: _trim_for_log(item, limit, max_items) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        trimmed = [_trim_for_log(item, limit, max_items) for item in value[:max_items]]
+        if len(value) > max_items:
+            trimmed.append(f"<{len(value) - max_items} more items>")
+        return trimmed
+    return value
+
+@functools.lru_cache(maxsize=1)
+def get_args() -> "argparse.Namespace":
+    """
+    Parses the command-line arguments once; later calls return the same namespace.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="CodeCredX: Analyze candidate code contributions.")
+    parser.add_argument("--resume", type=str, help="Path to the candidate's resume file (e.g., /path/to/resume.pdf).")
+    parser.add_argument("--profile", type=str, help="URL of the candidate's GitHub profile (e.g., https://github.com/username).")
+    return parser.parse_args()
 
 def main():
+    # Imported here so that importing this module (e.g. for setup_logging) stays cheap
+    import json
+    from flow import create_shared_store, get_codecredx_flow
+
     logger = setup_logging()
 
     logger.info("Starting CodeCredX application...")
 
     # --- NEW: Argument Parsing ---
-    parser = argparse.ArgumentParser(description="CodeCredX: Analyze candidate code contributions.")
-    parser.add_argument("--resume", type=str, help="Path to the candidate's resume file (e.g., /path/to/resume.pdf).")
-    parser.add_argument("--profile", type=str, help="URL of the candidate's GitHub profile (e.g., https://github.com/username).")
-    args = parser.parse_args()
+    args = get_args()
 
     resume_file_path = args.resume
     github_profile_url = args.profile
@@ -54,26 +178,19 @@ def main():
         logger.warning("No resume file or GitHub profile provided. The application will use default simulated resume content.")
         
     if resume_file_path:
-        logger.info(f"Resume file path provided: {resume_file_path}")
+        logger.info("Resume file path provided: %s", resume_file_path)
     if github_profile_url:
-        logger.info(f"GitHub profile URL provided: {github_profile_url}")
+        logger.info("GitHub profile URL provided: %s", github_profile_url)
     # --- END: Argument Parsing ---
 
-    shared = {
-        "resume_text": None,
-        "github_project_urls": [], # This will be the final consolidated list
-        "other_urls": [],
-        "analyzed_github_projects": [],
-        "overall_candidate_metrics": {},
-        "candidate_report": None,
-        "resume_file_path": resume_file_path,
-        "github_profile_url": github_profile_url # NEW: Add profile url to shared
-    }
+    shared = create_shared_store(resume_file_path, github_profile_url)
 
-    logger.debug(f"Initial shared dictionary ID: {id(shared)}")
-    logger.debug(f"Initial shared dictionary content:\n{json.dumps(shared, indent=2)}")
+    # Serializing the whole shared store is expensive; only do it when DEBUG is on
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Initial shared dictionary ID: %s", id(shared))
+        logger.debug("Initial shared dictionary content:\n%s", json.dumps(shared, separators=(",", ":"), default=str))
 
-    codecredx_flow = create_codecredx_flow()
+    codecredx_flow = get_codecredx_flow()
 
     logger.info("\n--- Running CodeCredX Flow ---")
     try:
@@ -82,59 +199,52 @@ def main():
         logger.info("Flow.run completed. 'shared' dictionary was modified in-place.")
 
     except Exception as e:
-        logger.critical(f"An unhandled exception occurred during flow execution: {e}", exc_info=True)
+        logger.critical("An unhandled exception occurred during flow execution: %s", e, exc_info=True)
         logger.error("Flow terminated prematurely.")
 
     logger.info("\n--- CodeCredX Flow Execution Complete ---")
-    logger.debug(f"Final shared dictionary ID: {id(shared)}")
+    logger.debug("Final shared dictionary ID: %s", id(shared))
+
+    # Human-readable results go straight to stdout in one write; the log file
+    # gets one compact JSON record per project instead of the same text again
+    console_lines: List[str] = []
 
-    logger.info("\nExtracted GitHub Project URLs:")
-    if shared.get("github_project_urls"):
-        for url in shared["github_project_urls"]:
-            logger.info(f"- {url}")
+    github_project_urls = shared.get("github_project_urls") or ()
+    if github_project_urls:
+        console_lines.append("\nExtracted GitHub Project URLs:")
+        console_lines.append("\n".join(f"- {url}" for url in github_project_urls))
     else:
-        logger.info("No GitHub project URLs found.")
+        console_lines.append("\nExtracted GitHub Project URLs:\nNo GitHub project URLs found.")
 
-    logger.info("\nExtracted Other URLs:")
-    if shared.get("other_urls"):
-        for url in shared["other_urls"]:
-            logger.info(f"- {url}")
+    other_urls = shared.get("other_urls") or ()
+    if other_urls:
+        console_lines.append("\nExtracted Other URLs:")
+        console_lines.append("\n".join(f"- {url}" for url in other_urls))
     else:
-        logger.info("No other URLs found.")
-
-    logger.info("\nAnalyzed GitHub Projects (with Summaries and Scores):")
-    if shared.get("analyzed_github_projects"):
-        for project in shared["analyzed_github_projects"]:
-            logger.info(f"\n--- Project: {project['url']} ---")
-            logger.info(f"  Status: {project['status']}")
-            if project.get('error'):
-                logger.error(f"  Error: {project['error']}")
-            logger.info("  Metadata:")
-            for key, value in project['metadata'].items():
-                if key == "description" and value:
-                    logger.info(f"    {key}: {value[:70]}..." if len(value) > 70 else f"    {key}: {value}")
-                else:
-                    logger.info(f"    {key}: {value}")
-            if project.get('readme_content'):
-                logger.info(f"  README Content (first 100 chars):\n    {project['readme_content'][:100]}...")
-            else:
-                logger.info("  README Content: Not available or failed to fetch.")
-            logger.info(f"  LLM Summary: {project.get('summary')}")
-            logger.info("  Scores:")
-            if project.get("scores"):
-                for score_name, score_value in project["scores"].items():
-                    logger.info(f"    {score_name}: {score_value}")
-            else:
-                logger.info("    No scores assigned.")
+        console_lines.append("\nExtracted Other URLs:\nNo other URLs found.")
+
+    console_lines.append("\nAnalyzed GitHub Projects (with Summaries and Scores):")
+    analyzed_projects = shared.get("analyzed_github_projects") or ()
+    if analyzed_projects:
+        console_lines.append("\n".join(_render_project(project) for project in analyzed_projects))
+        log_result = results_logger.info # Bound once; called for every project below
+        for project in analyzed_projects:
+            # The README itself is not repeated in the log file
+            project_record = {key: value for key, value in project.items() if key != "readme_content"}
+            log_result("%s", json.dumps(project_record, separators=(",", ":"), default=str))
     else:
-        logger.info("No GitHub projects analyzed.")
+        console_lines.append("No GitHub projects analyzed.")
 
-    logger.info("\n--- Overall Candidate Metrics ---")
-    if shared.get("overall_candidate_metrics"):
-        for metric_name, metric_value in shared["overall_candidate_metrics"].items():
-            logger.info(f"  {metric_name}: {metric_value}")
+    metrics = shared.get("overall_candidate_metrics")
+    if metrics:
+        console_lines.append("\n--- Overall Candidate Metrics ---")
+        console_lines.extend(f"  {metric_name}: {metric_value}" for metric_name, metric_value in metrics.items())
+        results_logger.info("%s", json.dumps(metrics, separators=(",", ":"), default=str))
     else:
-        logger.info("No overall candidate metrics found.")
+        console_lines.append("\n--- Overall Candidate Metrics ---\nNo overall candidate metrics found.")
+
+    flush_logging() # Earlier log lines must reach the console before the results
+    sys.stdout.write("\n".join(console_lines) + "\n")
 
     logger.info("\n--- Candidate Report Status ---")
     if shared.get("candidate_report"):
@@ -142,8 +252,9 @@ def main():
     else:
         logger.warning("Candidate report was not generated.")
 
-    logger.debug("\n--- Full Shared Dictionary State After Flow ---")
-    logger.debug(json.dumps(shared, indent=2))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("\n--- Full Shared Dictionary State After Flow ---")
+        logger.debug("%s", json.dumps(_trim_for_log(shared), separators=(",", ":"), default=str))
     logger.info("CodeCredX application finished.")
 
 if __name__ == "__main__":
@@ -0,0 +1,88 @@
+# models.py
+import logging
+import sqlite3
+import time
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+db = SQLAlchemy()
+
+# WAL lets leaderboard/report reads proceed while a worker commits results,
+# and makes a commit a single log append instead of a journal rewrite.
+_SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "mmap_size=268435456", # 256 MiB
+    "cache_size=-20000", # ~20 MB page cache
+)
+
+@event.listens_for(Engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Applies the SQLite pragmas to every new connection."""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    for pragma in _SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+class Candidate(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    github_username = db.Column(db.String(100), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default="pending") # pending, completed, failed
+    overall_score = db.Column(db.Float, nullable=False, default=0.0)
+    elo_score = db.Column(db.Float, nullable=False, default=800.0)
+    report_markdown = db.Column(db.Text, nullable=False, default="Processing...")
+    report_html = db.Column(db.Text, nullable=True) # Rendered once from report_markdown
+    worker_pid = db.Column(db.Integer, nullable=True) # Process whose in-memory queue holds the analysis
+
+    # Lets the leaderboard walk completed candidates in Elo order without a sort
+    __table_args__ = (db.Index('ix_candidate_status_elo_desc', status, elo_score.desc()),)
+    
+    def __repr__(self):
+        return f'<Candidate {self.github_username}>'
+
+# Columns added after candidates.db was first deployed. db.create_all() only creates
+# missing tables, so existing databases get these through ALTER TABLE. Rows that
+# predate `status` were analyzed synchronously, so they are already complete.
+_ADDED_COLUMNS = {
+    "status": "VARCHAR(20) NOT NULL DEFAULT 'completed'",
+    "report_html": "TEXT",
+    "worker_pid": "INTEGER",
+}
+
+def upgrade_schema() -> None:
+    """Adds any missing columns and indexes to an existing candidate table. Idempotent."""
+    table = Candidate.__table__
+    existing = {column["name"] for column in inspect(db.engine).get_columns(table.name)}
+    with db.engine.begin() as conn:
+        for name, ddl in _ADDED_COLUMNS.items():
+            if name not in existing:
+                logger.info(f"Adding missing column {table.name}.{name}.")
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {name} {ddl}"))
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+_INIT_DB_ATTEMPTS = 5
+
+def init_db() -> None:
+    """
+    Creates missing tables, then adds missing columns and indexes. Every app server
+    worker runs this at boot, so a worker that loses a DDL race to a sibling (e.g.
+    "duplicate column name", "table already exists") waits and checks again.
+    """
+    for attempt in range(1, _INIT_DB_ATTEMPTS + 1):
+        try:
+            db.create_all()
+            upgrade_schema()
+            return
+        except OperationalError as e:
+            if attempt == _INIT_DB_ATTEMPTS:
+                raise
+            logger.warning(f"Schema setup raced with another worker ({e.orig}), re-checking.")
+            time.sleep(0.2 * attempt)
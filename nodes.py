@@ -1,16 +1,19 @@
 # nodes.py
 from pocketflow import Node
-import re
 import requests
-import base64
+import functools
+import itertools
 import logging
 import random
-import io
-from typing import List, Dict, Any, Optional
-
-import PyPDF2 # Ensure this is installed: pip install PyPDF2
-
-from utils.call_llm import call_llm
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Dict, Any, Optional
+from urllib.parse import parse_qs, urlparse
+
+import regex_patterns
+from utils.extract_pdf_text import extract_pdf_text, PdfExtractionError
+from utils.github_session import github_session, has_github_token
+from utils.github_username import extract_github_username
+from utils.parse_json import parse_json
 from config import app_config
 
 logger = logging.getLogger(__name__)
@@ -23,7 +26,7 @@ class ResumeInputNode(Node):
         """
         file_path = shared.get("resume_file_path")
         if file_path:
-            logger.debug(f"Resume file path retrieved from shared in prep: {file_path}")
+            logger.debug("Resume file path retrieved from shared in prep: %s", file_path)
         return file_path
 
     def exec(self, file_path: Optional[str]) -> str:
@@ -36,11 +39,7 @@ class ResumeInputNode(Node):
             logger.info(f"Attempting to read resume content from file: {file_path}")
             try:
                 if file_path.lower().endswith('.pdf'):
-                    with open(file_path, 'rb') as f:
-                        reader = PyPDF2.PdfReader(f)
-                        for page_num in range(len(reader.pages)):
-                            page = reader.pages[page_num]
-                            resume_content += page.extract_text() or ''
+                    resume_content = extract_pdf_text(file_path)
                     logger.info(f"Successfully extracted text from PDF: {file_path}. Content length: {len(resume_content)} chars.")
                 elif file_path.lower().endswith('.txt'):
                     with open(file_path, 'r', encoding='utf-8') as f:
@@ -52,7 +51,7 @@ class ResumeInputNode(Node):
             except FileNotFoundError:
                 logger.error(f"Resume file not found at: {file_path}. Falling back to simulated content.")
                 file_path = None
-            except PyPDF2.errors.PdfReadError:
+            except PdfExtractionError:
                 logger.error(f"Error reading PDF file {file_path}. It might be corrupted or encrypted. Falling back to simulated content.", exc_info=True)
                 file_path = None
             except Exception as e:
@@ -106,59 +105,61 @@ class URLExtractionNode(Node):
         """
         logger.info("Extracting URLs from resume text...")
 
-        # Normalize whitespace (including newlines) to a single space
-        normalized_text = re.sub(r'\s+', ' ', resume_text)
+        # Normalize whitespace (including newlines and Unicode spaces such as NBSP) to a single space
+        normalized_text = " ".join(resume_text.split())
+
+        # Dicts keep first-seen order while making the duplicate checks O(1)
+        github_project_urls: Dict[str, None] = {}
+        other_urls: Dict[str, None] = {}
 
-        github_project_urls: List[str] = []
-        other_urls: List[str] = []
+        # Every pattern needs a literal anchor, so a plain substring test lets passes that
+        # cannot match skip their regex scan. The patterns are case-insensitive, and
+        # under re.IGNORECASE "i" also matches the dotless "\u0131", which lower() keeps.
+        anchor_text = normalized_text.lower().replace("\u0131", "i")
 
         # --- Phase 1: Identify and Extract GitHub Project URLs ---
-        github_project_pattern = re.compile(
-            r'(?:https?://)?github\.com/([a-zA-Z0-9_-]+)/([a-zA-Z0-9_.-]+)'
-            r'(?:[^/\s\(\)]*)?'
-            r'(?:\s*\(Source Code\))?',
-            re.IGNORECASE
-        )
-
-        for match in github_project_pattern.finditer(normalized_text):
-            full_match = match.group(0).strip('.,;)!}"\'')
-            full_match = re.sub(r'\s*\(Source Code\)\s*', '', full_match, flags=re.IGNORECASE).strip()
-
-            if not full_match.startswith("http"):
-                full_match = "https://" + full_match
-
-            base_repo_url_match = re.match(r'(https?://github\.com/[^/]+/[^/]+)', full_match, re.IGNORECASE)
-            if base_repo_url_match:
-                base_repo_url = base_repo_url_match.group(1)
-                if not any(sub in full_match for sub in ["/pull/", "/issues/", "/commit/", "/tree/", "/blob/", "/actions/"]) \
-                   and base_repo_url not in github_project_urls:
-                    github_project_urls.append(base_repo_url)
-                    logger.debug(f"Identified GitHub Project: {base_repo_url}")
-            else:
-                logger.debug(f"Matched GitHub-like string but not a project URL: {full_match}")
+        if "github.com/" in anchor_text:
+            for match in regex_patterns.GITHUB_PROJECT_URL.finditer(normalized_text):
+                full_match = match.group(0).strip('.,;)!}"\'')
+                full_match = regex_patterns.SOURCE_CODE_SUFFIX.sub('', full_match).strip()
+
+                if not full_match.startswith("http"):
+                    full_match = "https://" + full_match
+
+                base_repo_url_match = regex_patterns.GITHUB_BASE_REPO_URL.match(full_match)
+                if base_repo_url_match:
+                    base_repo_url = base_repo_url_match.group(1)
+                    # The match stops before the first '/' after the repository name, so
+                    # links into the repository are recognised by the text that follows it
+                    if not regex_patterns.GITHUB_NON_REPO_PATH.match(normalized_text, match.end()) \
+                       and base_repo_url not in github_project_urls:
+                        github_project_urls[base_repo_url] = None
+                        logger.debug("Identified GitHub Project: %s", base_repo_url)
+                else:
+                    logger.debug("Matched GitHub-like string but not a project URL: %s", full_match)
 
         # --- Phase 2: Identify and Extract other specific profile URLs ---
-        linkedin_pattern = re.compile(r'(?:https?://)?linkedin\.com/in/[a-zA-Z0-9_-]+(?:/?(?:[?#].*)?)?', re.IGNORECASE)
-        for url in linkedin_pattern.findall(normalized_text):
-            clean_url = url.strip('.,;)!}"\'')
-            if not clean_url.startswith("http"): clean_url = "https://" + clean_url
-            if clean_url not in other_urls: other_urls.append(clean_url)
-
-        leetcode_pattern = re.compile(r'(?:https?://)?leetcode\.com/u/[a-zA-Z0-9_-]+(?:/?(?:[?#].*)?)?', re.IGNORECASE)
-        for url in leetcode_pattern.findall(normalized_text):
-            clean_url = url.strip('.,;)!}"\'')
-            if not clean_url.startswith("http"): clean_url = "https://" + clean_url
-            if clean_url not in other_urls: other_urls.append(clean_url)
+        if "linkedin.com/in/" in anchor_text:
+            for url in regex_patterns.LINKEDIN_URL.findall(normalized_text):
+                clean_url = url.strip('.,;)!}"\'')
+                if not clean_url.startswith("http"): clean_url = "https://" + clean_url
+                if clean_url not in other_urls: other_urls[clean_url] = None
 
-        # --- Phase 3: Identify General URLs (that haven't been captured yet) ---
-        general_url_pattern = re.compile(r'https?://(?:[a-zA-Z0-9-]+\.)+[a-zA-Z]{2,}(?:/[^\s,;)"\']*)?', re.IGNORECASE)
-        for url in general_url_pattern.findall(normalized_text):
-            clean_url = url.strip('.,;)!}"\'')
-            if clean_url not in github_project_urls and clean_url not in other_urls:
+        if "leetcode.com/u/" in anchor_text:
+            for url in regex_patterns.LEETCODE_URL.findall(normalized_text):
+                clean_url = url.strip('.,;)!}"\'')
                 if not clean_url.startswith("http"): clean_url = "https://" + clean_url
-                other_urls.append(clean_url)
+                if clean_url not in other_urls: other_urls[clean_url] = None
 
-        extracted_data = {"github_project_urls": github_project_urls, "other_urls": other_urls}
+        # --- Phase 3: Identify General URLs (that haven't been captured yet) ---
+        if "http" in anchor_text:
+            for url in regex_patterns.GENERIC_URL.findall(normalized_text):
+                clean_url = url.strip('.,;)!}"\'')
+                if clean_url not in github_project_urls and clean_url not in other_urls:
+                    if not clean_url.startswith("http"): clean_url = "https://" + clean_url
+                    other_urls[clean_url] = None
+
+        extracted_data = {"github_project_urls": list(github_project_urls), "other_urls": list(other_urls)}
         logger.info(f"Extracted {len(extracted_data['github_project_urls'])} GitHub URLs and {len(extracted_data['other_urls'])} other URLs from resume.")
         return extracted_data
 
@@ -173,7 +174,7 @@ class GitHubProfileFetcherNode(Node):
         """Retrieves the GitHub profile URL from the shared dictionary."""
         profile_url = shared.get("github_profile_url")
         if profile_url:
-            logger.debug(f"GitHub profile URL retrieved from shared: {profile_url}")
+            logger.debug("GitHub profile URL retrieved from shared: %s", profile_url)
         return profile_url
 
     def exec(self, profile_url: Optional[str]) -> List[str]:
@@ -184,50 +185,62 @@ class GitHubProfileFetcherNode(Node):
             logger.info("No GitHub profile URL provided, skipping profile fetch.")
             return []
 
-        username_match = re.search(r'github\.com/([a-zA-Z0-9_-]+)', profile_url, re.IGNORECASE)
-        if not username_match:
+        username = extract_github_username(profile_url)
+        if not username:
             logger.warning(f"Invalid GitHub profile URL format: {profile_url}. Could not extract username.")
             return []
         
-        username = username_match.group(1)
         logger.info(f"Fetching public repositories for GitHub user: {username}")
 
         repos_api_url = f"https://api.github.com/users/{username}/repos"
-        headers = {}
-        if app_config.GITHUB_TOKEN and app_config.GITHUB_TOKEN != "your-github-personal-access-token-here":
-            headers["Authorization"] = f"token {app_config.GITHUB_TOKEN}"
 
         repo_urls: List[str] = []
-        page = 1
-        while True:
-            try:
-                params = {'per_page': 100, 'page': page}
-                response = requests.get(repos_api_url, headers=headers, params=params, timeout=10)
-                response.raise_for_status()
-                repos_data = response.json()
-
-                if not repos_data:
-                    break
-
+        try:
+            for page, repos_data in enumerate(self._iter_repo_pages(repos_api_url), start=1):
                 for repo in repos_data:
                     if not repo.get('fork'):
                         repo_urls.append(repo['html_url'])
-                
                 logger.info(f"Fetched {len(repos_data)} repos on page {page} for user {username}.")
-                if len(repos_data) < 100:
-                    break
-                page += 1
 
-            except requests.exceptions.HTTPError as e:
-                logger.error(f"HTTP error fetching repos for {username}: {e}")
-                break
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Request error fetching repos for {username}: {e}")
-                break
+        except requests.exceptions.HTTPError as e:
+            logger.error(f"HTTP error fetching repos for {username}: {e}")
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Request error fetching repos for {username}: {e}")
         
         logger.info(f"Found {len(repo_urls)} non-forked public repositories for user {username}.")
         return repo_urls
 
+    def _iter_repo_pages(self, repos_api_url: str) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yields the user's repository pages in order. The first response's Link header
+        names the last page, so the remaining pages are fetched concurrently.
+        """
+        first_response = self._get_repos_page(repos_api_url, 1)
+        yield parse_json(first_response.content)
+
+        last_page = self._last_page_number(first_response)
+        if last_page <= 1:
+            return
+        fetch_page = functools.partial(self._get_repos_page, repos_api_url)
+        with ThreadPoolExecutor(max_workers=min(app_config.GITHUB_MAX_WORKERS, last_page - 1)) as pool:
+            for response in pool.map(fetch_page, range(2, last_page + 1)):
+                yield parse_json(response.content)
+
+    @staticmethod
+    def _get_repos_page(repos_api_url: str, page: int) -> requests.Response:
+        """Fetches one page of up to 100 repositories, raising on HTTP errors."""
+        response = github_session.get(repos_api_url, params={'per_page': 100, 'page': page}, timeout=10)
+        response.raise_for_status()
+        return response
+
+    @staticmethod
+    def _last_page_number(response: requests.Response) -> int:
+        """Reads the page number of the rel="last" link; 1 when everything fit on one page."""
+        last_link = response.links.get("last")
+        if not last_link:
+            return 1
+        return int(parse_qs(urlparse(last_link["url"]).query).get("page", ["1"])[0])
+
     def post(self, shared: Dict[str, Any], prep_res: Optional[str], exec_res: List[str]) -> str:
         """Stores the fetched profile repo URLs in a temporary key."""
         shared["profile_github_urls"] = exec_res
@@ -251,10 +264,9 @@ class URLConsolidatorNode(Node):
         from_resume = url_sources.get("from_resume", [])
         from_profile = url_sources.get("from_profile", [])
 
-        consolidated_urls = set(from_resume)
-        consolidated_urls.update(from_profile)
-        
-        final_list = sorted(list(consolidated_urls))
+        # Resume projects first, then the rest of the profile, each URL once. This keeps a
+        # stable order between runs without sorting.
+        final_list = list(dict.fromkeys(itertools.chain(from_resume, from_profile)))
         
         logger.info(f"Consolidated sources: {len(from_resume)} from resume, {len(from_profile)} from profile.")
         logger.info(f"Total unique GitHub project URLs to analyze: {len(final_list)}")
@@ -266,78 +278,200 @@ class URLConsolidatorNode(Node):
         shared["github_project_urls"] = exec_res
         return "default"
 
+# Repository fields requested for every alias in the analyzer's GraphQL query.
+# "HEAD:README.md" resolves to the README blob, whose text arrives already decoded.
+_GRAPHQL_REPO_FRAGMENT = """
+fragment RepoFields on Repository {
+  name description stargazerCount isFork isPrivate createdAt updatedAt pushedAt diskUsage
+  repositoryTopics(first: 20) { nodes { topic { name } } }
+  readme: object(expression: "HEAD:README.md") { ... on Blob { text } }
+}
+"""
+
+_RAW_CONTENT_HEADERS = {"Accept": "application/vnd.github.raw"}
+
 class GitHubAnalyzerNode(Node):
     def prep(self, shared: Dict[str, Any]) -> List[str]:
         return shared.get("github_project_urls", [])
 
     def exec(self, github_urls: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetches metadata and README for every repository. The requests are IO-bound,
+        so repositories are analyzed concurrently over a shared keep-alive session.
+        """
         logger.info("Analyzing GitHub repositories for metadata and READMEs...")
-        analyzed_projects: List[Dict[str, Any]] = []
-        github_api_base = app_config.GITHUB_API_BASE_URL
-
-        headers = {}
-        if app_config.GITHUB_TOKEN and app_config.GITHUB_TOKEN != "your-github-personal-access-token-here":
-            headers["Authorization"] = f"token {app_config.GITHUB_TOKEN}"
+        if has_github_token():
             logger.info("Using GitHub Personal Access Token for API requests.")
         else:
             logger.warning("GitHub Personal Access Token not provided or is a placeholder. API rate limits and private repo access might be affected.")
 
-        for url in github_urls:
-            owner_repo_match = re.match(r'https?://github.com/([^/]+)/([^/]+)', url)
-            if not owner_repo_match:
-                logger.warning(f"Skipping invalid GitHub URL format encountered: {url}")
+        if not github_urls:
+            return []
+
+        # The GraphQL API only accepts authenticated requests
+        if has_github_token():
+            try:
+                return self._analyze_repos_graphql(github_urls)
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"GraphQL repository query failed ({e}), falling back to the REST API.")
+
+        max_workers = min(app_config.GITHUB_MAX_WORKERS, len(github_urls))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(self._analyze_repo, github_urls))
+        return [project for project in results if project is not None]
+
+    @staticmethod
+    def _new_project(url: str) -> Optional[Dict[str, Any]]:
+        """Builds the empty project record for a repository URL, or None if the URL is not a repo."""
+        owner_repo_match = regex_patterns.GITHUB_OWNER_REPO.match(url)
+        if not owner_repo_match:
+            logger.warning(f"Skipping invalid GitHub URL format encountered: {url}")
+            return None
+
+        repo_name = owner_repo_match.group(2)
+        if repo_name.endswith(".git"): # Clone URLs
+            repo_name = repo_name[:-len(".git")]
+
+        return {
+            "url": url, "owner": owner_repo_match.group(1), "repo_name": repo_name, "status": "pending",
+            "metadata": {}, "readme_content": None, "error": None, "summary": None, "scores": {}
+        }
+
+    def _analyze_repos_graphql(self, github_urls: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetches metadata and README text with one GraphQL query per batch of repositories
+        instead of two REST calls per repository.
+        """
+        projects = [project for project in map(self._new_project, github_urls) if project is not None]
+        batch_size = app_config.GITHUB_GRAPHQL_BATCH_SIZE
+        for start in range(0, len(projects), batch_size):
+            self._fetch_graphql_batch(projects[start:start + batch_size])
+
+        # Only README.md is resolved in the query; other README names take one REST call each
+        missing_readme = [p for p in projects if p["status"] == "success" and p["readme_content"] is None]
+        if missing_readme:
+            with ThreadPoolExecutor(max_workers=min(app_config.GITHUB_MAX_WORKERS, len(missing_readme))) as pool:
+                list(pool.map(self._fetch_missing_readme, missing_readme))
+        return projects
+
+    def _fetch_graphql_batch(self, projects: List[Dict[str, Any]]) -> None:
+        """Fills in a batch of project records from a single aliased GraphQL query."""
+        variable_defs: List[str] = []
+        fields: List[str] = []
+        variables: Dict[str, str] = {}
+        for i, project in enumerate(projects):
+            variable_defs.append(f"$o{i}: String!, $n{i}: String!")
+            fields.append(f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...RepoFields }}")
+            variables[f"o{i}"] = project["owner"]
+            variables[f"n{i}"] = project["repo_name"]
+        query = f"query({', '.join(variable_defs)}) {{ {' '.join(fields)} }}{_GRAPHQL_REPO_FRAGMENT}"
+
+        response = github_session.post(app_config.GITHUB_GRAPHQL_URL, json={"query": query, "variables": variables}, timeout=30)
+        response.raise_for_status()
+        payload = parse_json(response.content)
+
+        all_errors = payload.get("errors") or []
+        data = payload.get("data")
+        # Errors without a path (RATE_LIMITED, a malformed query) fail the whole query;
+        # raising lets exec fall back to the REST API instead of failing every repository
+        query_errors = [error.get("message", "unknown error") for error in all_errors if not error.get("path")]
+        if not data or (query_errors and not any(data.values())):
+            raise requests.exceptions.RequestException(
+                f"GraphQL query returned no data: {'; '.join(query_errors) or 'no error reported'}",
+                response=response,
+            )
+        errors = {error["path"][0]: error for error in all_errors if error.get("path")}
+        for i, project in enumerate(projects):
+            repo = data.get(f"r{i}")
+            if repo is None:
+                error = errors.get(f"r{i}", {})
+                project["status"] = "failed"
+                if error.get("type") == "NOT_FOUND":
+                    project["error"] = "Repository not found."
+                else:
+                    project["error"] = f"GraphQL error: {error.get('message', 'no data returned')}"
                 continue
 
-            owner = owner_repo_match.group(1)
-            repo_name = owner_repo_match.group(2)
-            repo_api_url = f"{github_api_base}{owner}/{repo_name}"
+            project["metadata"] = {
+                "name": repo.get("name"), "description": repo.get("description"),
+                "stars": repo.get("stargazerCount"), "fork": repo.get("isFork"),
+                "topics": [node["topic"]["name"] for node in repo["repositoryTopics"]["nodes"]],
+                "visibility": "private" if repo.get("isPrivate") else "public",
+                "created_at": repo.get("createdAt"), "updated_at": repo.get("updatedAt"),
+                "pushed_at": repo.get("pushedAt"), "size": repo.get("diskUsage")
+            }
 
-            project_data: Dict[str, Any] = {
-                "url": url, "owner": owner, "repo_name": repo_name, "status": "pending",
-                "metadata": {}, "readme_content": None, "error": None, "summary": None, "scores": {}
+            readme = repo.get("readme")
+            if readme and readme.get("text") is not None:
+                project["readme_content"] = readme["text"]
+                logger.info("Successfully fetched README for %s/%s.", project['owner'], project['repo_name'])
+
+            project["status"] = "success"
+
+    def _analyze_repo(self, url: str) -> Optional[Dict[str, Any]]:
+        """Fetches metadata and README for a single repository URL."""
+        project_data = self._new_project(url)
+        if project_data is None:
+            return None
+
+        owner = project_data["owner"]
+        repo_name = project_data["repo_name"]
+        repo_api_url = f"{app_config.GITHUB_API_BASE_URL}{owner}/{repo_name}"
+
+        try:
+            repo_response = github_session.get(repo_api_url, timeout=10)
+            repo_response.raise_for_status()
+            repo_metadata = parse_json(repo_response.content)
+
+            project_data["metadata"] = {
+                "name": repo_metadata.get("name"), "description": repo_metadata.get("description"),
+                "stars": repo_metadata.get("stargazers_count"), "fork": repo_metadata.get("fork"),
+                "topics": repo_metadata.get("topics", []), "visibility": "private" if repo_metadata.get("private") else "public",
+                "created_at": repo_metadata.get("created_at"), "updated_at": repo_metadata.get("updated_at"),
+                "pushed_at": repo_metadata.get("pushed_at"), "size": repo_metadata.get("size")
             }
 
-            try:
-                repo_response = requests.get(repo_api_url, headers=headers, timeout=10)
-                repo_response.raise_for_status()
-                repo_metadata = repo_response.json()
-
-                project_data["metadata"] = {
-                    "name": repo_metadata.get("name"), "description": repo_metadata.get("description"),
-                    "stars": repo_metadata.get("stargazers_count"), "fork": repo_metadata.get("fork"),
-                    "topics": repo_metadata.get("topics", []), "visibility": "private" if repo_metadata.get("private") else "public",
-                    "created_at": repo_metadata.get("created_at"), "updated_at": repo_metadata.get("updated_at"),
-                    "pushed_at": repo_metadata.get("pushed_at"), "size": repo_metadata.get("size")
-                }
-
-                readme_api_url = f"{repo_api_url}/contents/README.md"
-                readme_response = requests.get(readme_api_url, headers=headers, timeout=10)
-
-                if readme_response.status_code == 200:
-                    readme_data = readme_response.json()
-                    if readme_data.get("encoding") == "base64" and readme_data.get("content"):
-                        project_data["readme_content"] = base64.b64decode(readme_data["content"]).decode('utf-8')
-                        logger.info(f"Successfully fetched README for {owner}/{repo_name}.")
-                elif readme_response.status_code == 404:
-                    project_data["error"] = "README.md not found."
-                else:
-                    project_data["error"] = f"Failed to fetch README: HTTP Status {readme_response.status_code}."
+            self._fetch_readme(project_data)
+            project_data["status"] = "success"
 
-                project_data["status"] = "success"
+        except requests.exceptions.HTTPError as e:
+            status_code = e.response.status_code
+            error_msg = f"HTTP error {status_code}"
+            if status_code == 404: error_msg = "Repository not found."
+            elif status_code == 403: error_msg = "Access forbidden (private repo or rate limit exceeded)."
+            project_data["status"] = "failed"
+            project_data["error"] = error_msg
+        except requests.exceptions.RequestException as e:
+            project_data["status"] = "failed"
+            project_data["error"] = f"Network or request error: {e}"
 
-            except requests.exceptions.HTTPError as e:
-                status_code = e.response.status_code
-                error_msg = f"HTTP error {status_code}"
-                if status_code == 404: error_msg = "Repository not found."
-                elif status_code == 403: error_msg = "Access forbidden (private repo or rate limit exceeded)."
-                project_data["status"] = "failed"
-                project_data["error"] = error_msg
-            except requests.exceptions.RequestException as e:
-                project_data["status"] = "failed"
-                project_data["error"] = f"Network or request error: {e}"
-            
-            analyzed_projects.append(project_data)
-        return analyzed_projects
+        return project_data
+
+    @staticmethod
+    def _fetch_readme(project: Dict[str, Any]) -> None:
+        """
+        Fetches the repository's README through the /readme endpoint, which resolves
+        whichever README the repository has (README.md, readme.rst, ...). The raw media
+        type returns the file itself instead of base64 wrapped in JSON.
+        """
+        readme_api_url = f"{app_config.GITHUB_API_BASE_URL}{project['owner']}/{project['repo_name']}/readme"
+        readme_response = github_session.get(readme_api_url, headers=_RAW_CONTENT_HEADERS, timeout=10)
+
+        if readme_response.status_code == 200:
+            if readme_response.content:
+                project["readme_content"] = readme_response.content.decode('utf-8', errors='replace')
+                logger.info("Successfully fetched README for %s/%s.", project['owner'], project['repo_name'])
+        elif readme_response.status_code == 404:
+            project["error"] = "README not found."
+        else:
+            project["error"] = f"Failed to fetch README: HTTP Status {readme_response.status_code}."
+
+    def _fetch_missing_readme(self, project: Dict[str, Any]) -> None:
+        """Falls back to the /readme endpoint for a repository without a HEAD:README.md blob."""
+        try:
+            self._fetch_readme(project)
+        except requests.exceptions.RequestException as e:
+            project["error"] = f"Failed to fetch README: {e}"
 
     def post(self, shared: Dict[str, Any], prep_res: List[str], exec_res: List[Dict[str, Any]]) -> str:
         shared["analyzed_github_projects"] = exec_res
@@ -345,44 +479,138 @@ class GitHubAnalyzerNode(Node):
 
 # ... (LLMSummarizerNode, ContributionNode, OriginalityNode, TrustHeuristicNode, CandidateAggregationNode, EloRankingNode, ReportGenerationNode remain unchanged) ...
 
+# Fixed instruction text of the summarization prompts; the project content is appended.
+# Changing these strings changes every prompt and so invalidates the LLM response cache.
+_README_PROMPT_HEAD = "Summarize the following GitHub repository README content in 2-3 sentences, focusing on the project's purpose and key features:\n\n"
+_DESCRIPTION_PROMPT_HEAD = "Summarize the following project description in one concise sentence:\n\n"
+
 class LLMSummarizerNode(Node):
     def prep(self, shared: Dict[str, Any]) -> List[Dict[str, Any]]:
         return shared.get("analyzed_github_projects", [])
 
     def exec(self, analyzed_projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Summarizes every project with the LLM. Each call is dominated by waiting on
+        the model server, so a bounded number of projects are summarized concurrently.
+        """
         logger.info("Generating LLM summaries for projects...")
-        updated_projects: List[Dict[str, Any]] = []
+        if not analyzed_projects:
+            return []
 
+        # Projects that end up with the same prompt (e.g. forks sharing a README) share one call
+        projects_by_prompt: Dict[str, List[Dict[str, Any]]] = {}
         for project in analyzed_projects:
+            prompt = self._build_prompt(project)
+            if prompt is not None:
+                projects_by_prompt.setdefault(prompt, []).append(project)
+
+        if projects_by_prompt:
+            max_workers = min(app_config.LLM_MAX_WORKERS, len(projects_by_prompt))
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                summaries = pool.map(self._generate_summary, projects_by_prompt)
+                for projects, summary in zip(projects_by_prompt.values(), summaries):
+                    for project in projects:
+                        project["summary"] = summary
+        return analyzed_projects
+
+    @staticmethod
+    def _strip_readme_noise(readme: str) -> str:
+        """Drops HTML comments and code blocks; a README made only of those is kept as is."""
+        stripped = regex_patterns.README_NOISE.sub('', readme)
+        stripped = regex_patterns.BLANK_LINE_RUN.sub('\n\n', stripped).strip()
+        return stripped or readme
+
+    @staticmethod
+    def _trim_readme(readme: str, max_chars: int = app_config.LLM_README_MAX_CHARS) -> str:
+        """
+        Keeps the start and end of an oversized README. The purpose and key features
+        are almost always near the top, so the middle is the cheapest part to drop.
+        """
+        if len(readme) <= max_chars:
+            return readme
+        half = max_chars // 2
+        return f"{readme[:half]}\n...\n{readme[-half:]}"
+
+    def _build_prompt(self, project: Dict[str, Any]) -> Optional[str]:
+        """
+        The summarization prompt for a project, or None after writing a placeholder
+        summary when the project failed analysis or has nothing to summarize.
+        """
+        if project["status"] != "success":
+            project["summary"] = f"Could not summarize: {project['error'] or 'Analysis failed'}"
+            return None
+        if project["readme_content"]:
+            return _README_PROMPT_HEAD + self._trim_readme(self._strip_readme_noise(project["readme_content"]))
+        if project["metadata"].get("description"):
+            return _DESCRIPTION_PROMPT_HEAD + project["metadata"]["description"]
+        project["summary"] = "No content available to summarize for this project."
+        return None
+
+    @staticmethod
+    def _generate_summary(prompt: str) -> str:
+        try:
+            # Imported on first use: loading call_llm sets up its own log file handler
+            from utils.call_llm import call_llm
+            return call_llm(prompt)
+        except Exception as e:
+            return f"Error generating summary from LLM: {e}"
+
+    def post(self, shared: Dict[str, Any], prep_res: List[Dict[str, Any]], exec_res: List[Dict[str, Any]]) -> str:
+        shared["analyzed_github_projects"] = exec_res
+        return "default"
+
+# Placeholder summaries written by LLMSummarizerNode when no real summary was produced
+_FAILED_SUMMARY_PREFIXES = ("Error generating", "No content available")
+
+def _contribution_score(project: Dict[str, Any]) -> float:
+    """Simulated contribution score derived from the repository's stars."""
+    stars = project["metadata"].get("stars", 0)
+    return min(100, round(stars / 100, 2))
+
+def _originality_score(project: Dict[str, Any]) -> int:
+    """Simulated originality score: full marks unless the repository is a fork."""
+    is_fork = project["metadata"].get("fork", False)
+    return 100 if not is_fork else random.randint(30, 70)
+
+def _trust_score(project: Dict[str, Any], contrib_score: float, orig_score: float) -> float:
+    """Simulated trust score combining README/summary quality with the other two scores."""
+    trust_score_calc = 0
+    if project["readme_content"] and project["summary"] and not project["summary"].startswith(_FAILED_SUMMARY_PREFIXES):
+        trust_score_calc += 30
+    trust_score_calc += (contrib_score * 0.3) + (orig_score * 0.7)
+    return round(min(100, trust_score_calc), 2)
+
+class ProjectScoringNode(Node):
+    def prep(self, shared: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return shared.get("analyzed_github_projects", [])
+
+    def exec(self, projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Computes the contribution, originality and trust scores in a single pass
+        over the projects instead of one pass per score.
+        """
+        logger.info("Calculating contribution, originality and trust scores (simulated)...")
+        for project in projects:
+            scores = project["scores"]
             if project["status"] == "success":
-                content_to_summarize = ""
-                prompt = ""
-                if project["readme_content"]:
-                    content_to_summarize = project["readme_content"]
-                    prompt = f"Summarize the following GitHub repository README content in 2-3 sentences, focusing on the project's purpose and key features:\n\n{content_to_summarize}"
-                elif project["metadata"].get("description"):
-                    content_to_summarize = project["metadata"]["description"]
-                    prompt = f"Summarize the following project description in one concise sentence:\n\n{content_to_summarize}"
-                else:
-                    project["summary"] = "No content available to summarize for this project."
-                    updated_projects.append(project)
-                    continue
-
-                try:
-                    summary = call_llm(prompt)
-                    project["summary"] = summary
-                except Exception as e:
-                    project["summary"] = f"Error generating summary from LLM: {e}"
+                contrib_score = _contribution_score(project)
+                orig_score = _originality_score(project)
+                scores["contribution_score"] = contrib_score
+                scores["originality_score"] = orig_score
+                scores["trust_score"] = _trust_score(project, contrib_score, orig_score)
             else:
-                project["summary"] = f"Could not summarize: {project['error'] or 'Analysis failed'}"
-
-            updated_projects.append(project)
-        return updated_projects
+                scores["contribution_score"] = 0
+                scores["originality_score"] = 0
+                scores["trust_score"] = 0
+        return projects
 
     def post(self, shared: Dict[str, Any], prep_res: List[Dict[str, Any]], exec_res: List[Dict[str, Any]]) -> str:
         shared["analyzed_github_projects"] = exec_res
         return "default"
 
+# The single-score nodes below are kept for flows that need one score on its own;
+# the default pipeline uses ProjectScoringNode.
+
 class ContributionNode(Node):
     def prep(self, shared: Dict[str, Any]) -> List[Dict[str, Any]]:
         return shared.get("analyzed_github_projects", [])
@@ -391,9 +619,7 @@ class ContributionNode(Node):
         logger.info("Calculating contribution scores (simulated)...")
         for project in projects:
             if project["status"] == "success":
-                stars = project["metadata"].get("stars", 0)
-                contribution_score = min(100, round(stars / 100, 2))
-                project["scores"]["contribution_score"] = contribution_score
+                project["scores"]["contribution_score"] = _contribution_score(project)
             else:
                 project["scores"]["contribution_score"] = 0
         return projects
@@ -410,9 +636,7 @@ class OriginalityNode(Node):
         logger.info("Calculating originality scores (simulated)...")
         for project in projects:
             if project["status"] == "success":
-                is_fork = project["metadata"].get("fork", False)
-                originality_score = 100 if not is_fork else random.randint(30, 70)
-                project["scores"]["originality_score"] = originality_score
+                project["scores"]["originality_score"] = _originality_score(project)
             else:
                 project["scores"]["originality_score"] = 0
         return projects
@@ -429,13 +653,9 @@ class TrustHeuristicNode(Node):
         logger.info("Calculating trust heuristic scores (simulated)...")
         for project in projects:
             if project["status"] == "success":
-                trust_score_calc = 0
-                if project["readme_content"] and project["summary"] and "Error generating" not in project["summary"]:
-                    trust_score_calc += 30
                 contrib_score = project["scores"].get("contribution_score", 0)
                 orig_score = project["scores"].get("originality_score", 0)
-                trust_score_calc += (contrib_score * 0.3) + (orig_score * 0.7)
-                project["scores"]["trust_score"] = round(min(100, trust_score_calc), 2)
+                project["scores"]["trust_score"] = _trust_score(project, contrib_score, orig_score)
             else:
                 project["scores"]["trust_score"] = 0
         return projects
@@ -486,17 +706,18 @@ class ReportGenerationNode(Node):
     def exec(self, report_data: Dict[str, Any]) -> str:
         logger.info("Generating candidate report...")
         report = ["# CodeCredX Candidate Report\n"]
+        add = report.append
         metrics = report_data['overall_candidate_metrics']
-        report.append(f"## Candidate Overview\n**Overall Score:** {metrics.get('overall_candidate_score', 'N/A')}\n**Simulated Elo Rating:** {metrics.get('elo_score', 'N/A')}\n")
+        add(f"## Candidate Overview\n**Overall Score:** {metrics.get('overall_candidate_score', 'N/A')}\n**Simulated Elo Rating:** {metrics.get('elo_score', 'N/A')}\n")
         
-        report.append("\n## Analyzed Projects\n")
+        add("\n## Analyzed Projects\n")
         for project in report_data.get('analyzed_github_projects', []):
-            report.append(f"### [{project['repo_name']}]({project['url']})\n- **Status:** {project['status']}\n")
-            if project.get('error'): report.append(f"- **Error:** {project['error']}\n")
-            if project.get('summary'): report.append(f"- **LLM Summary:** {project['summary']}\n")
+            add(f"### [{project['repo_name']}]({project['url']})\n- **Status:** {project['status']}\n")
+            if project.get('error'): add(f"- **Error:** {project['error']}\n")
+            if project.get('summary'): add(f"- **LLM Summary:** {project['summary']}\n")
             if project.get('scores'):
                 scores_str = ', '.join([f"{k}: {v}" for k, v in project['scores'].items()])
-                report.append(f"- **Scores:** {scores_str}\n")
+                add(f"- **Scores:** {scores_str}\n")
         
         return "".join(report)
 
@@ -504,7 +725,8 @@ class ReportGenerationNode(Node):
         shared["candidate_report"] = exec_res
         report_filename = "logs/candidate_report.md"
         try:
-            with open(report_filename, "w", encoding="utf-8") as f: f.write(exec_res)
+            # Encode once and write the bytes straight through, skipping the text-mode wrapper
+            with open(report_filename, "wb") as f: f.write(exec_res.encode("utf-8"))
             logger.info(f"Candidate report saved to {report_filename}")
         except IOError as e:
             logger.error(f"Failed to save report to file {report_filename}: {e}")
@@ -0,0 +1,50 @@
+# regex_patterns.py
+"""
+Compiled regular expressions shared by the flow nodes and the web app.
+Compiling once at import avoids the `re` module cache lookup on every call.
+
+When google-re2 is installed the patterns are compiled with RE2, whose
+automaton-based matching runs in linear time over the resume text and cannot
+backtrack catastrophically. Case-insensitivity is expressed inline with
+`(?i)` so the same pattern strings work with both engines.
+
+RE2's `\s` only matches ASCII whitespace, while `re` also matches NBSP and the
+other Unicode spaces common in PDF text. Resume text is therefore normalized
+with str.split() (Unicode-aware under both engines) before these patterns run,
+so `\s` only ever sees ASCII spaces.
+"""
+try:
+    import re2 as _engine
+except ImportError:
+    import re as _engine
+
+ENGINE_NAME = _engine.__name__
+
+# GitHub
+GITHUB_USER_URL = _engine.compile(r'(?i)github\.com/([a-zA-Z0-9_-]+)')
+# The optional tail stops at the next '/', so a match never includes a path into the
+# repository; GITHUB_NON_REPO_PATH is checked against the text that follows the match
+GITHUB_PROJECT_URL = _engine.compile(
+    r'(?i)(?:https?://)?github\.com/([a-zA-Z0-9_-]+)/([a-zA-Z0-9_.-]+)'
+    r'(?:[^/\s\(\)]*)?'
+    r'(?:\s*\(Source Code\))?'
+)
+SOURCE_CODE_SUFFIX = _engine.compile(r'(?i)\s*\(Source Code\)\s*')
+GITHUB_BASE_REPO_URL = _engine.compile(r'(?i)(https?://github\.com/[^/]+/[^/]+)')
+# Links into a repository (PRs, issues, files) rather than to the repository itself;
+# matched at the end of a GITHUB_PROJECT_URL match
+GITHUB_NON_REPO_PATH = _engine.compile(r'/(?:pull|issues|commit|tree|blob|actions)/')
+# Owner and repository name only; a query string, fragment or sub-path after the name is not captured
+GITHUB_OWNER_REPO = _engine.compile(r'(?i)https?://github\.com/([^/?#\s]+)/([a-zA-Z0-9_.-]+)')
+
+# Other profiles
+LINKEDIN_URL = _engine.compile(r'(?i)(?:https?://)?linkedin\.com/in/[a-zA-Z0-9_-]+(?:/?(?:[?#].*)?)?')
+LEETCODE_URL = _engine.compile(r'(?i)(?:https?://)?leetcode\.com/u/[a-zA-Z0-9_-]+(?:/?(?:[?#].*)?)?')
+
+# Any other HTTP(S) link
+GENERIC_URL = _engine.compile(r'(?i)https?://(?:[a-zA-Z0-9-]+\.)+[a-zA-Z]{2,}(?:/[^\s,;)"\']*)?')
+
+# README content that costs LLM tokens without describing the project:
+# HTML comments and fenced code blocks
+README_NOISE = _engine.compile(r'(?ms)<!--.*?-->|^[ \t]*```.*?^[ \t]*```[^\n]*$|^[ \t]*~~~.*?^[ \t]*~~~[^\n]*$')
+BLANK_LINE_RUN = _engine.compile(r'\n\s*\n')
@@ -0,0 +1,117 @@
+# tasks.py
+import functools
+import logging
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict
+
+from flask import Flask
+
+from flow import get_codecredx_flow
+from models import db, Candidate
+from config import app_config
+from utils.render_markdown import render_markdown
+
+logger = logging.getLogger(__name__)
+
+# Background workers that run the flow outside of the request/response cycle.
+_executor = ThreadPoolExecutor(max_workers=app_config.ANALYSIS_WORKERS, thread_name_prefix="codecredx-worker")
+
+def _update_candidate(candidate_id: int, **fields: Any) -> None:
+    """Applies all result fields to a candidate row inside one transaction."""
+    with db.session.begin():
+        candidate = db.session.get(Candidate, candidate_id)
+        if candidate is None:
+            logger.error(f"Candidate {candidate_id} no longer exists, discarding analysis results.")
+            return
+        for name, value in fields.items():
+            setattr(candidate, name, value)
+
+def run_codecredx(app: Flask, candidate_id: int, shared: Dict[str, Any]) -> None:
+    """
+    Runs the CodeCredX flow for a pending candidate and persists the results.
+    Executed on a background worker thread, so it pushes its own app context.
+    """
+    with app.app_context():
+        logger.info(f"Starting CodeCredX flow for candidate {candidate_id}...")
+        try:
+            get_codecredx_flow().run(shared)
+        except Exception as e:
+            logger.critical(f"An error occurred during flow execution for candidate {candidate_id}: {e}", exc_info=True)
+            _update_candidate(candidate_id, status="failed", report_markdown="An unexpected error occurred during analysis.")
+            return
+        logger.info(f"CodeCredX flow completed successfully for candidate {candidate_id}.")
+
+        # Extract results from the shared dictionary
+        metrics = shared.get("overall_candidate_metrics", {})
+        report_md = shared.get("candidate_report") or "Report could not be generated."
+        try:
+            _update_candidate(
+                candidate_id,
+                overall_score=metrics.get('overall_candidate_score', 0.0),
+                elo_score=metrics.get('elo_score', 800.0),
+                report_markdown=report_md,
+                # The report is immutable once written, so render it to HTML only once
+                report_html=render_markdown(report_md),
+                status="completed",
+            )
+        except Exception as e:
+            logger.critical(f"Failed to save analysis results for candidate {candidate_id}: {e}", exc_info=True)
+            _update_candidate(candidate_id, status="failed", report_markdown="An unexpected error occurred while saving the analysis.")
+            return
+        logger.info(f"Saved analysis results for candidate {candidate_id} to database.")
+
+def _on_analysis_done(app: Flask, candidate_id: int, future: Future) -> None:
+    """
+    Last-resort handler for errors that escaped `run_codecredx` (e.g. the database
+    was locked while recording a failure), so the row does not stay pending forever.
+    """
+    error = future.exception()
+    if error is None:
+        return
+    logger.critical(f"Analysis task for candidate {candidate_id} crashed: {error}", exc_info=error)
+    try:
+        with app.app_context():
+            _update_candidate(candidate_id, status="failed", report_markdown="An unexpected error occurred during analysis.")
+    except Exception as e:
+        logger.error(f"Could not mark candidate {candidate_id} as failed: {e}", exc_info=True)
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0) # Signal 0 only checks that the process exists
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True # Exists, but belongs to another user
+    return True
+
+def fail_orphaned_analyses() -> None:
+    """
+    Marks pending candidates as failed when the worker process that queued them has
+    exited. The queue lives in process memory, so a gunicorn worker that is restarted,
+    killed on timeout or recycled takes its queued and running analyses with it.
+    Called at worker boot; rows owned by live sibling workers are left alone.
+    """
+    own_pid = os.getpid()
+    with db.session.begin():
+        pending = (db.session.query(Candidate.id, Candidate.worker_pid)
+                   .filter(Candidate.status == "pending").all())
+        # Nothing has been queued in this process yet, so a row carrying its pid is from
+        # an earlier process that happened to have the same pid
+        orphaned_ids = [candidate_id for candidate_id, pid in pending
+                        if pid is None or pid == own_pid or not _process_alive(pid)]
+        if not orphaned_ids:
+            return
+        (db.session.query(Candidate)
+         .filter(Candidate.id.in_(orphaned_ids), Candidate.status == "pending")
+         .update({"status": "failed",
+                  "report_markdown": "The analysis was interrupted because its worker stopped. Please submit again."},
+                 synchronize_session=False))
+    logger.warning(f"Marked {len(orphaned_ids)} orphaned pending analyses as failed: {orphaned_ids}")
+
+def enqueue_analysis(app: Flask, candidate_id: int, shared: Dict[str, Any]) -> Future:
+    """Schedules `run_codecredx` on the background worker pool and returns immediately."""
+    logger.info(f"Queued CodeCredX analysis for candidate {candidate_id}.")
+    future = _executor.submit(run_codecredx, app, candidate_id, shared)
+    future.add_done_callback(functools.partial(_on_analysis_done, app, candidate_id))
+    return future
@@ -1,9 +1,16 @@
 import os
+import hashlib
 import logging
-import json
+import sqlite3
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from dotenv import load_dotenv
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.parse_json import parse_json
 
 # Load environment variables from .env
 load_dotenv()
@@ -25,37 +32,128 @@ file_handler.setFormatter(
 )
 logger.addHandler(file_handler)
 
-# Cache file
-cache_file = "llm_cache.json"
+# Cache database; entries from the JSON cache used by earlier versions are imported once
+cache_file = os.getenv("LLM_CACHE_FILE", "llm_cache.db")
+legacy_cache_file = "llm_cache.json"
+# One connection is shared by every call_llm thread, so access to it is serialized
+_cache_lock = threading.Lock()
+# Recently used responses, keyed by prompt hash, kept in memory in front of the database
+_MEMORY_CACHE_SIZE = 1024
+_memory_cache: "OrderedDict[str, str]" = OrderedDict()
+
+def _cache_key(model: str, prompt: str) -> str:
+    """
+    Cache entries are keyed by the SHA-256 of the model and prompt, so README-sized
+    prompts are not stored twice and switching models does not reuse old answers.
+    """
+    return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+def _create_session() -> requests.Session:
+    """
+    One pooled session shared by every call_llm thread, so each prompt reuses a
+    kept-alive connection to Ollama instead of opening a new one.
+    """
+    session = requests.Session()
+    pool_size = int(os.getenv("LLM_MAX_WORKERS", "5"))
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False,
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+_session = _create_session()
+
+def _open_cache() -> sqlite3.Connection:
+    """
+    Opens the SQLite response cache, so a lookup or insert touches one row
+    instead of parsing and rewriting the whole cache on every prompt.
+    """
+    conn = sqlite3.connect(cache_file, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, response TEXT NOT NULL)")
+    # The legacy file is only read, and only into a new (empty) database
+    is_empty = conn.execute("SELECT 1 FROM llm_cache LIMIT 1").fetchone() is None
+    if is_empty and os.path.exists(legacy_cache_file):
+        try:
+            with open(legacy_cache_file, "rb") as f:
+                legacy = parse_json(f.read())
+            with conn:
+                conn.executemany("INSERT OR IGNORE INTO llm_cache VALUES (?, ?)", legacy.items())
+            logger.info(f"Imported {len(legacy)} cached responses from {legacy_cache_file}")
+        except Exception as e:
+            logger.warning(f"Failed to import {legacy_cache_file}: {e}")
+    return conn
+
+_cache = _open_cache()
+
+def _remember(key: str, response_text: str) -> None:
+    # Caller holds _cache_lock
+    _memory_cache[key] = response_text
+    _memory_cache.move_to_end(key)
+    if len(_memory_cache) > _MEMORY_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+
+def _cache_get(key: str, *fallback_keys: str):
+    """
+    The cached response stored under key, or else under the first fallback key
+    present, or None. Database hits are kept in memory under key.
+    """
+    with _cache_lock:
+        if key in _memory_cache:
+            _memory_cache.move_to_end(key)
+            return _memory_cache[key]
+        for candidate in (key, *fallback_keys):
+            row = _cache.execute("SELECT response FROM llm_cache WHERE key = ?", (candidate,)).fetchone()
+            if row is not None:
+                _remember(key, row[0])
+                return row[0]
+    return None
+
+def _cache_set(key: str, response_text: str) -> None:
+    with _cache_lock:
+        _remember(key, response_text)
+        with _cache:
+            _cache.execute("INSERT OR REPLACE INTO llm_cache VALUES (?, ?)", (key, response_text))
 
 # Function to call LLaMA via Ollama
 def call_llm(prompt: str, use_cache: bool = True) -> str:
     logger.info(f"PROMPT: {prompt}")
 
-    # Load from cache if enabled
-    cache = {}
-    if use_cache and os.path.exists(cache_file):
-        try:
-            with open(cache_file, "r", encoding="utf-8") as f:
-                cache = json.load(f)
-        except Exception:
-            logger.warning("Failed to load cache, starting with empty cache")
-
-        if prompt in cache:
-            logger.info(f"RESPONSE (from cache): {cache[prompt]}")
-            return cache[prompt]
-
     # Read model name from environment or use default
     model = os.getenv("LLM_MODEL", "llama3")  # Make sure llama3 is pulled in Ollama
 
+    # Load from cache if enabled
+    key = _cache_key(model, prompt)
+    if use_cache:
+        # Entries written before hashing was introduced are keyed by the raw prompt
+        try:
+            cached = _cache_get(key, prompt)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read cache: {e}")
+            cached = None
+        if cached is not None:
+            logger.info(f"RESPONSE (from cache): {cached}")
+            return cached
+
     # Send prompt to Ollama
     try:
-        response = requests.post(
+        response = _session.post(
             "http://localhost:11434/api/generate",
             json={
                 "model": model,
                 "prompt": prompt,
-                "stream": False
+                "stream": False,
+                # Summaries are a few sentences; stop runaway generations early
+                "options": {"num_predict": int(os.getenv("LLM_NUM_PREDICT", "256"))}
             }
         )
     except Exception as e:
@@ -68,7 +166,7 @@ def call_llm(prompt: str, use_cache: bool = True) -> str:
         raise Exception(error_msg)
 
     try:
-        response_text = response.json().get("response", "").strip()
+        response_text = parse_json(response.content).get("response", "").strip()
     except Exception as e:
         logger.error(f"Failed to parse Ollama response: {e}")
         raise Exception(f"Parsing error: {e}")
@@ -77,11 +175,9 @@ def call_llm(prompt: str, use_cache: bool = True) -> str:
 
     # Save to cache
     if use_cache:
-        cache[prompt] = response_text
         try:
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(cache, f, indent=2, ensure_ascii=False)
-        except Exception as e:
+            _cache_set(key, response_text)
+        except sqlite3.Error as e:
             logger.warning(f"Failed to save cache: {e}")
 
     return response_text
@@ -0,0 +1,72 @@
+import hashlib
+import io
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Prefer PDFium (C++ via pypdfium2); fall back to the pure-Python PyPDF2 parser
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+    import PyPDF2
+
+_CACHE_SIZE = 32
+_text_cache: "OrderedDict[str, str]" = OrderedDict()
+_cache_lock = threading.Lock()
+# PDFium is not thread-safe, even across separate documents, so only one
+# thread may be inside the library at a time
+_pdfium_lock = threading.Lock()
+
+class PdfExtractionError(Exception):
+    """Raised when a PDF cannot be parsed (corrupted, encrypted, not a PDF)."""
+
+def _extract_with_pdfium(data: bytes) -> str:
+    with _pdfium_lock:
+        try:
+            pdf = pdfium.PdfDocument(data)
+        except pdfium.PdfiumError as e:
+            raise PdfExtractionError(str(e)) from e
+        try:
+            pages_text = []
+            for page in pdf:
+                textpage = page.get_textpage()
+                pages_text.append(textpage.get_text_range())
+                textpage.close()
+                page.close()
+            return "\n".join(pages_text)
+        finally:
+            pdf.close()
+
+def _extract_with_pypdf2(data: bytes) -> str:
+    try:
+        reader = PyPDF2.PdfReader(io.BytesIO(data))
+        return "\n".join(page.extract_text() or '' for page in reader.pages)
+    except PyPDF2.errors.PdfReadError as e:
+        raise PdfExtractionError(str(e)) from e
+
+def extract_pdf_text(file_path: str) -> str:
+    """
+    Extracts the text of every page of a PDF file.
+    Results are cached by the SHA-256 of the file contents, so re-uploads of
+    the same resume skip parsing entirely.
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+
+    with _cache_lock:
+        if digest in _text_cache:
+            _text_cache.move_to_end(digest)
+            logger.debug(f"PDF text cache hit for {file_path}.")
+            return _text_cache[digest]
+
+    text = _extract_with_pdfium(data) if pdfium is not None else _extract_with_pypdf2(data)
+
+    with _cache_lock:
+        _text_cache[digest] = text
+        if len(_text_cache) > _CACHE_SIZE:
+            _text_cache.popitem(last=False)
+    return text
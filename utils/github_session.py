@@ -0,0 +1,169 @@
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+import requests
+from requests.auth import AuthBase
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import app_config
+
+logger = logging.getLogger(__name__)
+
+# Optional on-disk HTTP cache; GitHub answers ETag revalidations with 304s,
+# which do not count against the API rate limit
+try:
+    from requests_cache import CachedSession
+except ImportError:
+    CachedSession = None
+
+_TOKEN_PLACEHOLDER = "your-github-personal-access-token-here"
+
+def github_tokens() -> List[str]:
+    """The configured GitHub tokens: GITHUB_TOKENS if set, otherwise the single GITHUB_TOKEN."""
+    tokens = app_config.GITHUB_TOKENS or [app_config.GITHUB_TOKEN]
+    return [token for token in tokens if token and token != _TOKEN_PLACEHOLDER]
+
+def has_github_token() -> bool:
+    """True when at least one real GitHub Personal Access Token (not the placeholder) is configured."""
+    return bool(github_tokens())
+
+class RotatingTokenAuth(AuthBase):
+    """
+    Signs each request with the next token in round-robin order. A token whose
+    rate limit runs out is skipped until its X-RateLimit-Reset time passes.
+    """
+    def __init__(self, tokens: List[str]):
+        self._tokens = tokens
+        self._cycle = itertools.cycle(tokens)
+        self._exhausted_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _next_available_token(self) -> Optional[str]:
+        """The next token in round-robin order that still has quota, or None."""
+        with self._lock:
+            now = time.time()
+            for _ in range(len(self._tokens)):
+                token = next(self._cycle)
+                if self._exhausted_until.get(token, 0) <= now:
+                    return token
+        return None
+
+    def _earliest_reset(self) -> float:
+        with self._lock:
+            return min(self._exhausted_until.get(token, 0) for token in self._tokens)
+
+    def _next_token(self) -> str:
+        token = self._next_available_token()
+        if token is None:
+            # Every token is exhausted, so use whichever resets first
+            with self._lock:
+                token = min(self._tokens, key=lambda token: self._exhausted_until.get(token, 0))
+        return token
+
+    def __call__(self, request: requests.PreparedRequest) -> requests.PreparedRequest:
+        request.headers["Authorization"] = f"token {self._next_token()}"
+        return request
+
+    def record_rate_limit(self, response: requests.Response, *args, **kwargs) -> Optional[requests.Response]:
+        """
+        Response hook for a primary rate limit (403/429 with X-RateLimit-Remaining: 0).
+        Parks the token until its reset time and resends the request signed with a
+        token that still has quota. When every token is exhausted, waits for the
+        earliest reset if it is at most GITHUB_RATE_LIMIT_MAX_WAIT seconds away;
+        otherwise the rate-limited response is returned unchanged.
+        """
+        if response.status_code not in (403, 429) or response.headers.get("X-RateLimit-Remaining") != "0":
+            return None
+        token = response.request.headers.get("Authorization", "").partition(" ")[2]
+        reset_at = float(response.headers.get("X-RateLimit-Reset", time.time() + 60))
+        with self._lock:
+            self._exhausted_until[token] = reset_at
+        logger.warning(f"GitHub token ending in ...{token[-4:]} is rate limited until {time.ctime(reset_at)}.")
+
+        connection = getattr(response, "connection", None)
+        if connection is None: # e.g. a response served from the cache
+            return None
+        next_token = self._next_available_token()
+        if next_token is None:
+            wait = max(self._earliest_reset() - time.time(), 0)
+            if wait > app_config.GITHUB_RATE_LIMIT_MAX_WAIT:
+                return None
+            logger.info(f"All GitHub tokens are rate limited, waiting {wait:.0f}s for the reset.")
+            time.sleep(wait + 1) # X-RateLimit-Reset has one-second resolution
+            next_token = self._next_token()
+
+        retry_request = response.request.copy()
+        retry_request.headers["Authorization"] = f"token {next_token}"
+        # Read the body so the connection is released back to the pool before resending
+        response.content
+        response.close()
+        retried = connection.send(retry_request, **kwargs)
+        retried.history.append(response)
+        retried.request = retry_request
+        return retried
+
+class GitHubRetry(Retry):
+    """
+    Retries transient GitHub failures, sleeping for Retry-After when it is sent.
+    A 403 or 429 is only retried here when it carries Retry-After (a secondary rate
+    limit). Without it, the repository is private, the token lacks access, or the
+    token's primary limit is used up; resending with the same token cannot help, so
+    the last case is left to RotatingTokenAuth.record_rate_limit.
+    """
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if status_code in (403, 429) and not has_retry_after:
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+def create_github_session() -> requests.Session:
+    """
+    Creates a requests.Session for the GitHub API with keep-alive connection
+    pooling sized for the analyzer's worker threads, rate-limit-aware retries
+    and token auth preset.
+    Responses (including GraphQL query results) are cached on disk and revalidated
+    by ETag when requests-cache is installed.
+    """
+    if CachedSession is not None:
+        session = CachedSession(
+            app_config.GITHUB_CACHE_FILE,
+            backend="sqlite",
+            expire_after=app_config.GITHUB_CACHE_EXPIRE,
+            cache_control=True,
+            stale_if_error=True,
+            # GraphQL queries are POSTs; the cache key includes the request body
+            allowable_methods=("GET", "HEAD", "POST"),
+            # Raw and JSON representations of the same URL must not share an entry
+            match_headers=["Accept"],
+        )
+    else:
+        logger.debug("requests-cache not installed, GitHub responses will not be cached.")
+        session = requests.Session()
+    retry = GitHubRetry(
+        total=app_config.GITHUB_MAX_RETRIES,
+        backoff_factor=1,
+        status_forcelist=(403, 429, 502, 503, 504),
+        # GraphQL queries are read-only, so retrying the POST is safe
+        allowed_methods=("GET", "HEAD", "POST"),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=app_config.GITHUB_MAX_WORKERS,
+        pool_maxsize=app_config.GITHUB_MAX_WORKERS,
+        max_retries=retry,
+    )
+    session.mount("https://", adapter)
+    tokens = github_tokens()
+    if tokens:
+        auth = RotatingTokenAuth(tokens)
+        session.auth = auth
+        session.hooks["response"].append(auth.record_rate_limit)
+    return session
+
+# Shared by all nodes so repeated calls reuse open TLS connections
+github_session = create_github_session()
+
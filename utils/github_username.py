@@ -0,0 +1,26 @@
+from typing import Optional
+
+import regex_patterns
+
+_GITHUB_PREFIX = "github.com/"
+_USERNAME_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-")
+
+def extract_github_username(url: str) -> Optional[str]:
+    """
+    Returns the username segment that follows `github.com/` in a URL, or None.
+    Scans the string directly for the common lowercase host and only falls back
+    to the case-insensitive regex when that fast path finds nothing.
+    """
+    start = url.find(_GITHUB_PREFIX)
+    if start >= 0:
+        start += len(_GITHUB_PREFIX)
+        end = start
+        n = len(url)
+        while end < n and url[end] in _USERNAME_CHARS:
+            end += 1
+        if end > start:
+            return url[start:end]
+
+    match = regex_patterns.GITHUB_USER_URL.search(url)
+    return match.group(1) if match else None
+
@@ -0,0 +1,16 @@
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Prefer orjson (Rust) for decoding API payloads; fall back to the stdlib parser
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    logger.debug("orjson not installed, falling back to the json module.")
+    _loads = json.loads
+
+def parse_json(data):
+    """Decodes a JSON document given as UTF-8 bytes (e.g. response.content) or str."""
+    return _loads(data)
@@ -0,0 +1,17 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Prefer the Rust-backed markdown-it port; fall back to pure-Python markdown2
+try:
+    from markdown_it_pyrs import MarkdownIt
+    _md = MarkdownIt("commonmark")
+    _render = _md.render
+except ImportError:
+    import markdown2
+    logger.debug("markdown-it-pyrs not installed, falling back to markdown2.")
+    _render = markdown2.markdown
+
+def render_markdown(text: str) -> str:
+    """Renders a markdown report to HTML."""
+    return _render(text)